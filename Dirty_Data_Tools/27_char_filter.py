@@ -3,6 +3,7 @@
 import os
 import sys
 from tqdm import tqdm
+from wordlist_io import open_wordlist
 
 def filter_wordlist(input_file, max_length=27):
     output_dir = 'output'
@@ -12,8 +13,8 @@ def filter_wordlist(input_file, max_length=27):
     output_file_path = os.path.join(output_dir, output_file_name)
 
     try:
-        with open(input_file, 'r', encoding='utf-8') as infile, \
-                open(output_file_path, 'w', encoding='utf-8') as outfile:
+        with open_wordlist(input_file) as infile, \
+                open_wordlist(output_file_path, 'w') as outfile:
             # Use tqdm directly on the file object for progress feedback
             for line in tqdm(infile, desc="Processing", unit=' lines'):
                 if len(line.strip()) <= max_length:
@@ -1,8 +1,19 @@
 import os
 import mmap
 import argparse
+from wordlist_io import is_compressed, open_wordlist
+
+def count_lines_in_compressed_file(filename):
+    lines = 0
+    with open_wordlist(filename) as f:
+        for lines, _ in enumerate(f, start=1):
+            if lines % 1000000 == 0:
+                print(f"\rLines: {lines}", end='')
+    return lines
 
 def count_lines_with_mmap_and_progress(filename):
+    if is_compressed(filename):
+        return count_lines_in_compressed_file(filename)
     total_size = os.path.getsize(filename)
     with open(filename, 'r+b') as f:
         mm = mmap.mmap(f.fileno(), 0)
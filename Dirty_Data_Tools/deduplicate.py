@@ -1,6 +1,7 @@
 import os
 import sys
 from tqdm import tqdm
+from wordlist_io import is_compressed, open_wordlist
 
 def deduplicate_file(file_path):
     output_dir = os.path.join(os.getcwd(), 'deduplicated')
@@ -9,9 +10,10 @@ def deduplicate_file(file_path):
     output_file_path = os.path.join(output_dir, os.path.basename(file_path))
     seen_lines = set()
 
-    file_size = os.path.getsize(file_path)
-    with open(file_path, 'r', encoding='utf-8') as file, \
-         open(output_file_path, 'w', encoding='utf-8') as out_file, \
+    # Compressed input has no meaningful byte total for the progress bar
+    file_size = None if is_compressed(file_path) else os.path.getsize(file_path)
+    with open_wordlist(file_path) as file, \
+         open_wordlist(output_file_path, 'w') as out_file, \
          tqdm(total=file_size, desc=f"Deduplicating {os.path.basename(file_path)}", unit='B', unit_scale=True, unit_divisor=1024) as pbar:
 
         for line in file:
@@ -24,7 +26,7 @@ def deduplicate_file(file_path):
 
 def deduplicate_folder():
     for filename in os.listdir(os.getcwd()):
-        if filename.endswith('.txt'):
+        if filename.endswith(('.txt', '.txt.gz', '.txt.zst')):
             deduplicate_file(filename)
 
 if __name__ == "__main__":
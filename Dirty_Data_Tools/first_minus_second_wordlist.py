@@ -3,6 +3,7 @@
 import os
 import sys
 from tqdm import tqdm
+from wordlist_io import open_wordlist
 
 def file_exists(file_path):
     """Check if a file exists at the given path."""
@@ -19,12 +20,12 @@ def compare_wordlists(first_wordlist_path, second_wordlist_path):
     output_file_path = os.path.join(output_dir, 'filtered_' + os.path.basename(first_wordlist_path))
 
     print("Loading second wordlist into memory. Please wait...")
-    with open(second_wordlist_path, 'r', encoding='utf-8') as second_file:
+    with open_wordlist(second_wordlist_path) as second_file:
         second_wordlist = set(tqdm((line.strip() for line in second_file), desc="Loading second wordlist"))
 
     print("Filtering first wordlist...")
-    with open(first_wordlist_path, 'r', encoding='utf-8') as first_file, \
-         open(output_file_path, 'w', encoding='utf-8') as output_file:
+    with open_wordlist(first_wordlist_path) as first_file, \
+         open_wordlist(output_file_path, 'w') as output_file:
         for line in tqdm(first_file, desc="Filtering first wordlist"):
             if line.strip() not in second_wordlist:
                 output_file.write(line)
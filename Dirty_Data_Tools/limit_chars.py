@@ -1,6 +1,7 @@
 import os
 import sys
 from tqdm import tqdm
+from wordlist_io import is_compressed, open_wordlist
 
 def process_lines(lines, out_buffer, desired_length):
     for line in lines:
@@ -18,11 +19,12 @@ def filter_wordlist_by_length(input_file, desired_length, chunk_size=1024 * 1024
     output_file_name = f"{desired_length:02}-chars_{os.path.basename(input_file)}"
     output_file_path = os.path.join(output_dir, output_file_name)
 
-    file_size = os.path.getsize(input_file)
+    # Compressed input has no meaningful byte total for the progress bar
+    file_size = None if is_compressed(input_file) else os.path.getsize(input_file)
     out_buffer = []
 
-    with open(input_file, 'r', encoding='utf-8') as file, \
-         open(output_file_path, 'w', encoding='utf-8') as out_file, \
+    with open_wordlist(input_file) as file, \
+         open_wordlist(output_file_path, 'w') as out_file, \
          tqdm(total=file_size, desc="Filtering Wordlist", unit='B', unit_scale=True, unit_divisor=1024) as progress_bar:
 
         buffer = ''
@@ -1,6 +1,7 @@
 import os
 import sys
 from tqdm import tqdm
+from wordlist_io import open_wordlist
 
 def process_password_file(file_path):
     if not os.path.exists(file_path):
@@ -11,18 +12,20 @@ def process_password_file(file_path):
     os.makedirs(output_dir, exist_ok=True)
 
     total_processed = 0
+    # Output files are appended one line at a time, so they are always written as plain text
+    output_base_name = os.path.basename(file_path).removesuffix('.gz').removesuffix('.zst')
 
-    with open(file_path, 'r', encoding='utf-8') as file:
-        # Get total number of lines for progress bar
+    # Get total number of lines for progress bar (zstd streams cannot seek back, so reopen afterwards)
+    with open_wordlist(file_path) as file:
         total_lines = sum(1 for _ in file)
-        file.seek(0)  # Reset file pointer to the beginning
 
+    with open_wordlist(file_path) as file:
         with tqdm(total=total_lines, desc="Processing Passwords", unit='passwords') as progress_bar:
             for password in file:
                 password = password.strip()
                 if password:
                     length_str = f"{len(password):02}"
-                    output_file = f"{output_dir}/{length_str}-char-{os.path.basename(file_path)}"
+                    output_file = f"{output_dir}/{length_str}-char-{output_base_name}"
                     with open(output_file, 'a', encoding='utf-8') as out_file:
                         out_file.write(password + '\n')
                     total_processed += 1
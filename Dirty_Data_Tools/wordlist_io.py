@@ -0,0 +1,33 @@
+"""
+Wordlist I/O shared by the Dirty_Data_Tools scripts: plain, gzip (.gz) and zstd (.zst) wordlists as written by
+passgpt_generator.py. This mirrors open_wordlist() in passgpt_generator.py, which the tools do not import so
+they run without PyTorch. Keep the two (compression levels included) in sync.
+"""
+
+import gzip
+import io
+
+GZIP_LEVEL = 6  # Same as passgpt_generator.GZIP_LEVEL
+ZSTD_LEVEL = 3  # Same as passgpt_generator.ZSTD_LEVEL
+
+def is_compressed(file_path):
+    """Check whether a wordlist is a gzip (.gz) or zstd (.zst) stream, as written by passgpt_generator.py."""
+    return file_path.endswith(('.gz', '.zst'))
+
+def open_wordlist(file_path, mode='r'):
+    """Open a plain, gzip (.gz) or zstd (.zst) wordlist as UTF-8 text for reading ('r'), writing ('w') or appending ('a')."""
+    if file_path.endswith('.gz'):
+        return gzip.open(file_path, mode + 't', encoding='utf-8', compresslevel=GZIP_LEVEL)
+    if file_path.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError:
+            raise SystemExit("Reading .zst wordlists requires the 'zstandard' package (e.g., `pip install zstandard`).")
+        if mode == 'r':
+            # Appending sessions leave one zstd frame each, so read across frame boundaries
+            stream = zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), read_across_frames=True,
+                                                                closefd=True)
+        else:
+            stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(open(file_path, mode + 'b'), closefd=True)
+        return io.TextIOWrapper(stream, encoding='utf-8')
+    return open(file_path, mode, encoding='utf-8')
@@ -0,0 +1,314 @@
+"""
+Script Purpose:
+Offline benchmark suite for passgpt_generator.py. Instead of pulling javirandor/passgpt-* from the Hugging Face
+Hub it builds a randomly initialised GPT2LMHeadModel with PassGPT's vocabulary shape (5 special tokens plus the
+94 printable ASCII characters) and a character-level tokenizer written to a temporary directory, so it runs
+without network access. It measures:
+ - sampling throughput of every sampling engine across batch sizes and torch thread counts,
+ - length-bucket write throughput for each compression mode,
+ - shutdown deduplication time on synthetic length buckets of a configurable size.
+With --check-onnx it instead runs the ONNX backend parity test: the tiny model is exported and ONNX Runtime's
+next-token distributions are compared with the torch model's, including step-by-step decoding through both
+KV caches; the exit status is 1 if they diverge.
+
+Results are written to a JSON file; pass an earlier result file with --compare to report the change between commits.
+
+Usage:
+ - python3 passgpt_benchmark.py --output bench.json
+ - python3 passgpt_benchmark.py --output bench.json --compare baseline.json --fail-on-regression
+ - PassGPT-sized network: --layers 12 --hidden-size 768 --heads 12
+ - Multi-GB dedup run: --dedup-mb 4096 --work-dir /path/with/space
+ - ONNX parity test: python3 passgpt_benchmark.py --check-onnx
+"""
+
+import argparse
+import datetime
+import importlib.util
+import json
+import os
+import platform
+import random
+import shutil
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+import passgpt_generator as generator
+import torch
+import transformers
+from transformers import GPT2Config, GPT2LMHeadModel, RobertaTokenizerFast
+
+PASSGPT_SPECIAL_TOKENS = ['<s>', '<pad>', '</s>', '<unk>', '<mask>']
+PASSGPT_CHARACTERS = [c for c in string.printable if not c.isspace()]
+BENCHMARK_FILE = "passgpt-benchmark.json"
+SYNTHETIC_CHUNK = 200000  # Passwords generated per synthetic batch
+REGRESSION_THRESHOLD = 0.10  # Relative slowdown reported as a regression by --compare
+
+def build_tiny_model(model_dir, layers=2, hidden_size=64, heads=2, seed=0):
+    """Write a character-level PassGPT-style tokenizer to model_dir and build a random GPT-2 on top of it."""
+    vocab = {token: i for i, token in enumerate(PASSGPT_SPECIAL_TOKENS + PASSGPT_CHARACTERS)}
+    with open(os.path.join(model_dir, 'vocab.json'), 'w', encoding='utf-8') as vocab_file:
+        json.dump(vocab, vocab_file)
+    with open(os.path.join(model_dir, 'merges.txt'), 'w', encoding='utf-8') as merges_file:
+        merges_file.write('#version: 0.2\n')  # Characters only, no merges
+    tokenizer = RobertaTokenizerFast.from_pretrained(model_dir, model_max_length=18)
+    config = GPT2Config(vocab_size=len(vocab), n_positions=32, n_embd=hidden_size, n_layer=layers, n_head=heads,
+                        bos_token_id=vocab['<s>'], eos_token_id=vocab['</s>'], pad_token_id=vocab['<pad>'])
+    torch.manual_seed(seed)
+    model = GPT2LMHeadModel(config).to(generator.get_device()).eval()
+    return model, tokenizer
+
+def benchmark_sampling(model, tokenizer, samplers, batch_sizes, thread_counts, rounds):
+    """Passwords and tokens per second for every sampler, batch size and thread count combination."""
+    results = []
+    for threads in thread_counts:
+        torch.set_num_threads(threads)
+        for sampler_name in samplers:
+            sampler = generator.SAMPLERS[sampler_name]
+            for batch_size in batch_sizes:
+                sampler(model, tokenizer, batch_size)  # Warm-up
+                passwords, tokens, elapsed = 0, 0, 0.0
+                for _ in range(rounds):
+                    start_time = time.time()
+                    generated = sampler(model, tokenizer, batch_size)
+                    elapsed += time.time() - start_time
+                    passwords += generated.shape[0]
+                    tokens += generator.count_sampled_tokens(tokenizer, generated)
+                results.append({
+                    "sampler": sampler_name,
+                    "batch_size": batch_size,
+                    "threads": threads,
+                    "passwords_per_sec": round(passwords / elapsed, 1),
+                    "tokens_per_sec": round(tokens / elapsed, 1),
+                })
+                print(f"\tSampling | {sampler_name:8} | batch {batch_size:6} | {threads:3} threads | "
+                      f"{passwords / elapsed:10.0f} passwords/sec")
+    return results
+
+def synthetic_passwords(count, rng):
+    """Return count random printable passwords of length 1-17, roughly uniform over lengths."""
+    table = bytes(ord(PASSGPT_CHARACTERS[b % len(PASSGPT_CHARACTERS)]) for b in range(256))
+    lengths = [rng.randint(1, generator.MAX_PASSWORD_LENGTH) for _ in range(count)]
+    blob = rng.randbytes(sum(lengths)).translate(table).decode('ascii')
+    passwords, position = [], 0
+    for length in lengths:
+        passwords.append(blob[position:position + length])
+        position += length
+    return passwords
+
+def fill_buckets(output_dir, compression, target_bytes, rng, duplicate_previous=False):
+    """
+    Write synthetic passwords through BucketWriterPool until target_bytes of text have been written and
+    return (bytes, seconds spent writing). With duplicate_previous every chunk is written twice, so about
+    half of the lines are duplicates for the deduplication benchmark.
+    """
+    generator.setup_output_directory(output_dir, compression)
+    writer_pool = generator.BucketWriterPool(output_dir, compression)
+    written, elapsed = 0, 0.0
+    while written < target_bytes:
+        passwords = synthetic_passwords(SYNTHETIC_CHUNK, rng)
+        batches = [passwords, passwords[::-1]] if duplicate_previous else [passwords]
+        for batch in batches:
+            start_time = time.time()
+            generator.write_passwords_to_buckets(writer_pool, batch)
+            elapsed += time.time() - start_time
+            written += sum(len(password) + 1 for password in batch)
+    start_time = time.time()
+    writer_pool.close()
+    elapsed += time.time() - start_time
+    return written, elapsed
+
+def available_compressions(requested):
+    """Drop zstd when the optional zstandard package is not installed."""
+    if importlib.util.find_spec('zstandard') is not None:
+        return requested
+    if 'zstd' in requested:
+        print("\tSkipping zstd: the 'zstandard' package is not installed.")
+    return [compression for compression in requested if compression != 'zstd']
+
+def benchmark_bucket_writes(work_dir, compressions, target_mb, rng):
+    """Bucket write throughput (uncompressed MB/s) and on-disk size for each compression mode."""
+    results = []
+    for compression in compressions:
+        output_dir = tempfile.mkdtemp(prefix=f"write-{compression}-", dir=work_dir)
+        written, elapsed = fill_buckets(output_dir, compression, target_mb * 1024 * 1024, rng)
+        on_disk = sum(os.path.getsize(os.path.join(output_dir, f)) for f in generator.list_bucket_files(output_dir))
+        results.append({
+            "compression": compression,
+            "bytes": written,
+            "mb_per_sec": round(written / (1024 * 1024) / elapsed, 1),
+            "compression_ratio": round(written / on_disk, 2) if on_disk else 0.0,
+        })
+        print(f"\tBucket writes | {compression:5} | {written / (1024 * 1024) / elapsed:8.1f} MB/s")
+        shutil.rmtree(output_dir)
+    return results
+
+def benchmark_dedup(work_dir, compression, target_mb, memory_budget_mb, sort_workers, rng):
+    """Time deduplicate_and_consolidate() on synthetic buckets that are about half duplicates."""
+    output_dir = tempfile.mkdtemp(prefix="dedup-", dir=work_dir)
+    print(f"\tWriting {target_mb}MB of synthetic buckets for the dedup benchmark...")
+    written, _ = fill_buckets(output_dir, compression, target_mb * 1024 * 1024, rng, duplicate_previous=True)
+    start_time = time.time()
+    consolidated_path = generator.deduplicate_and_consolidate(output_dir, memory_budget_mb, sort_workers)
+    elapsed = time.time() - start_time
+    result = {
+        "compression": compression,
+        "bytes": written,
+        "seconds": round(elapsed, 2),
+        "mb_per_sec": round(written / (1024 * 1024) / elapsed, 1),
+        "consolidated_bytes": os.path.getsize(consolidated_path),
+        "sort_memory_mb": memory_budget_mb,
+    }
+    print(f"\tDedup | {written / (1024 * 1024):.0f}MB in {elapsed:.1f}s ({result['mb_per_sec']} MB/s)")
+    shutil.rmtree(output_dir)
+    return result
+
+def check_onnx_parity(model_dir, layers=2, hidden_size=64, heads=2, seed=0):
+    """Export the tiny model to ONNX and compare ONNX Runtime with torch. Returns the parity measurements."""
+    model, tokenizer = build_tiny_model(model_dir, layers, hidden_size, heads, seed)
+    model.cpu()
+    onnx_path = os.path.join(model_dir, generator.ONNX_ARTIFACT_FILE)
+    generator.export_onnx_decoder(model, onnx_path)
+    decoder = generator.OnnxRuntimeDecoder(onnx_path, model.config, model.generation_config)
+    return generator.check_onnx_parity(model, decoder, tokenizer)
+
+def git_commit():
+    """Return the current commit of the repository the benchmark lives in, if it can be determined."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def comparable_metrics(results):
+    """Flatten a result file into {metric name: value}, where higher values are better."""
+    metrics = {}
+    for entry in results.get('sampling', []):
+        key = f"sampling/{entry['sampler']}/batch={entry['batch_size']}/threads={entry['threads']}"
+        metrics[key] = entry['passwords_per_sec']
+    for entry in results.get('bucket_write', []):
+        metrics[f"bucket_write/{entry['compression']}"] = entry['mb_per_sec']
+    if results.get('dedup'):
+        metrics[f"dedup/{results['dedup']['compression']}"] = results['dedup']['mb_per_sec']
+    return metrics
+
+def compare_results(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """Print the relative change of every metric present in both runs and return the regressed metric names."""
+    baseline_metrics, current_metrics = comparable_metrics(baseline), comparable_metrics(current)
+    regressions = []
+    print(f"\nComparison against {baseline.get('git_commit') or 'baseline'}:")
+    for name in sorted(set(baseline_metrics) & set(current_metrics)):
+        before, after = baseline_metrics[name], current_metrics[name]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change < -threshold:
+            regressions.append(name)
+            flag = "  <-- regression"
+        print(f"\t{name:50} {before:12.1f} -> {after:12.1f} ({change:+.1%}){flag}")
+    return regressions
+
+def parse_int_list(value):
+    return [int(item) for item in value.split(',') if item]
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Offline PassGPT generator benchmarks on a tiny random GPT-2.")
+    parser.add_argument('--output', default=BENCHMARK_FILE,
+                        help=f"Where to write the JSON results (default: {BENCHMARK_FILE})")
+    parser.add_argument('--compare', default=None,
+                        help="Earlier result file to compare against")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help=f"Exit with status 1 when a metric is more than {REGRESSION_THRESHOLD:.0%} slower than --compare")
+    parser.add_argument('--skip', action='append', choices=['sampling', 'write', 'dedup'], default=[],
+                        help="Skip a benchmark section (repeatable)")
+    parser.add_argument('--layers', type=int, default=2, help="GPT-2 layers (default: 2)")
+    parser.add_argument('--hidden-size', type=int, default=64, help="GPT-2 hidden size (default: 64)")
+    parser.add_argument('--heads', type=int, default=2, help="GPT-2 attention heads (default: 2)")
+    parser.add_argument('--samplers', default=','.join(sorted(generator.SAMPLERS)),
+                        help="Comma-separated sampling engines (default: all)")
+    parser.add_argument('--batch-sizes', type=parse_int_list, default=[250, 1000, 4000],
+                        help="Comma-separated batch sizes (default: 250,1000,4000)")
+    parser.add_argument('--threads', type=parse_int_list, default=sorted({1, os.cpu_count() or 1}),
+                        help="Comma-separated torch thread counts (default: 1 and the CPU count)")
+    parser.add_argument('--rounds', type=int, default=3, help="Timed batches per configuration (default: 3)")
+    parser.add_argument('--compression', default='none,gzip,zstd',
+                        help="Comma-separated compression modes for the write benchmark (default: none,gzip,zstd)")
+    parser.add_argument('--write-mb', type=int, default=64,
+                        help="Text written per compression mode in the write benchmark (default: 64)")
+    parser.add_argument('--dedup-mb', type=int, default=256,
+                        help="Size of the synthetic buckets deduplicated in the dedup benchmark (default: 256)")
+    parser.add_argument('--dedup-compression', choices=sorted(generator.COMPRESSION_SUFFIXES), default='none',
+                        help="Compression of the synthetic dedup buckets (default: none)")
+    parser.add_argument('--sort-memory-mb', type=int, default=generator.SORT_MEMORY_BUDGET_MB,
+                        help=f"Memory budget for the dedup benchmark (default: {generator.SORT_MEMORY_BUDGET_MB})")
+    parser.add_argument('--sort-workers', type=int, default=None,
+                        help="Dedup worker processes (default: one per CPU)")
+    parser.add_argument('--work-dir', default=None,
+                        help="Directory for synthetic buckets (default: the system temporary directory)")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the model weights and synthetic data")
+    parser.add_argument('--check-onnx', action='store_true',
+                        help="Only run the ONNX backend parity test against torch (needs onnxruntime and onnx)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    if args.check_onnx:
+        generator.import_onnxruntime()
+        with tempfile.TemporaryDirectory(prefix="passgpt-onnx-parity-", dir=args.work_dir) as model_dir:
+            parity = check_onnx_parity(model_dir, args.layers, args.hidden_size, args.heads, args.seed)
+        print(f"Next-token KL vs torch: mean {parity['mean_kl']:.2e} / max {parity['max_kl']:.2e} nats; "
+              f"decoding through the KV cache: max {parity['decode_max_kl']:.2e} nats, "
+              f"max logit difference {parity['decode_max_logit_diff']:.2e} "
+              f"(limits {generator.ONNX_PARITY_MAX_KL} nats, {generator.ONNX_PARITY_MAX_LOGIT_DIFF})")
+        if not parity["passed"]:
+            print("ONNX parity check failed.")
+            sys.exit(1)
+        print("ONNX parity check passed.")
+        return
+    rng = random.Random(args.seed)
+    work_dir = tempfile.mkdtemp(prefix="passgpt-benchmark-", dir=args.work_dir)
+    results = {
+        "benchmark_version": 1,
+        "timestamp": datetime.datetime.now().isoformat(timespec='seconds'),
+        "git_commit": git_commit(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "transformers": transformers.__version__,
+        "cpu_count": os.cpu_count(),
+        "device": str(generator.get_device()),
+        "model": {"layers": args.layers, "hidden_size": args.hidden_size, "heads": args.heads},
+    }
+    try:
+        if 'sampling' not in args.skip:
+            print("\nBenchmarking sampling throughput...")
+            model_dir = os.path.join(work_dir, 'model')
+            os.makedirs(model_dir)
+            model, tokenizer = build_tiny_model(model_dir, args.layers, args.hidden_size, args.heads, args.seed)
+            results["sampling"] = benchmark_sampling(model, tokenizer, args.samplers.split(','), args.batch_sizes,
+                                                     args.threads, args.rounds)
+        if 'write' not in args.skip:
+            print("\nBenchmarking bucket writes...")
+            compressions = available_compressions(args.compression.split(','))
+            results["bucket_write"] = benchmark_bucket_writes(work_dir, compressions, args.write_mb, rng)
+        if 'dedup' not in args.skip:
+            print("\nBenchmarking shutdown deduplication...")
+            results["dedup"] = benchmark_dedup(work_dir, args.dedup_compression, args.dedup_mb, args.sort_memory_mb,
+                                               args.sort_workers, rng)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    with open(args.output, 'w', encoding='utf-8') as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as baseline_file:
+            regressions = compare_results(json.load(baseline_file), results)
+        if regressions and args.fail_on_regression:
+            print(f"\n{len(regressions)} metric(s) regressed by more than {REGRESSION_THRESHOLD:.0%}.")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
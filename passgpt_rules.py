@@ -0,0 +1,112 @@
+"""
+Script Purpose:
+Apply a hashcat rule file (best64 and similar) to any wordlist, writing the mutated candidates to a file or
+to stdout for a cracker to read, as `hashcat --stdout -r` does. The wordlist (plain, .gz or .zst) is read in
+chunks of words. Each rule is applied to a whole chunk at once as batched byte operations, and chunks are
+spread over worker processes. This is the engine behind passgpt_generator.py --rules. Words are handled
+as raw bytes, so lines that are not valid UTF-8 pass through unchanged. Candidates are written chunk by
+chunk, rule by rule within a chunk, and are not deduplicated. Rules using the memory functions
+(M, 4, 6, X, Q) are skipped with a warning.
+
+Usage:
+ - python3 passgpt_rules.py wordlist.txt --rules best64.rule --output mutated.txt
+ - python3 passgpt_rules.py passgpt-consolidated-wordlist.txt --rules best64.rule --output - | hashcat -m 1000 hashes.txt
+ - Compressed output: --output mutated.txt.zst
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import multiprocessing
+import os
+import sys
+import time
+
+import passgpt_generator as generator
+import torch
+
+RULE_CHUNK_WORDS = 4096  # Words per batch handed to a worker process
+
+def read_word_chunks(file_path, chunk_words=RULE_CHUNK_WORDS):
+    """Yield lists of raw words (line endings stripped) from a wordlist."""
+    chunk = []
+    with generator.open_wordlist_bytes(file_path) as wordlist:
+        for line in wordlist:
+            chunk.append(line.rstrip(b'\r\n'))
+            if len(chunk) >= chunk_words:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+def mutate_chunk(rules, words):
+    """Return the rule candidates of a chunk of words as newline-terminated bytes, and how many there are."""
+    parts = generator.rule_candidate_bytes(rules, words, generator.RULE_BUFFER_SIZE - 1, terminator=ord('\n'))
+    return b''.join(data for data, _ in parts), sum(len(lengths) for _, lengths in parts)
+
+def apply_rules_to_wordlist(rules, input_path, output_file, workers=1, chunk_words=RULE_CHUNK_WORDS):
+    """Write the rule candidates of every word to an open binary file. Returns (words read, candidates written)."""
+    word_count = candidate_count = 0
+    start_time = last_report = time.time()
+    # A bounded window of chunks in flight keeps memory flat and the output in input order
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                                initializer=torch.set_num_threads, initargs=(1,)) as executor:
+        pending = collections.deque()
+        for chunk in read_word_chunks(input_path, chunk_words):
+            pending.append(executor.submit(mutate_chunk, rules, chunk))
+            word_count += len(chunk)
+            while len(pending) > 2 * workers or (pending and pending[0].done()):
+                data, count = pending.popleft().result()
+                output_file.write(data)
+                candidate_count += count
+            if time.time() - last_report >= 10:
+                last_report = time.time()
+                print(f"{word_count} words, {candidate_count} candidates "
+                      f"({candidate_count / (last_report - start_time):.0f} candidates/sec)", file=sys.stderr)
+        for future in pending:
+            data, count = future.result()
+            output_file.write(data)
+            candidate_count += count
+    return word_count, candidate_count
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Apply a hashcat rule file to a wordlist.")
+    parser.add_argument('wordlist', help="Wordlist to mutate (plain, .gz or .zst)")
+    parser.add_argument('--rules', required=True, help="hashcat rule file, e.g. best64.rule")
+    parser.add_argument('--output', required=True,
+                        help="File to write the candidates to (a .gz or .zst suffix compresses it), or - for stdout")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes applying the rules (default: one per CPU)")
+    parser.add_argument('--chunk-words', type=int, default=RULE_CHUNK_WORDS,
+                        help=f"Words per batch handed to a worker (default: {RULE_CHUNK_WORDS})")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    for path in (args.wordlist, args.rules):
+        if not os.path.isfile(path):
+            print(f"File not found: {path}", file=sys.stderr)
+            sys.exit(2)
+    rules, skipped = generator.load_rule_file(args.rules)
+    for line_number, rule, reason in skipped:
+        print(f"Skipping rule '{rule}' on line {line_number}: {reason}", file=sys.stderr)
+    if not rules:
+        print(f"No usable rules in {args.rules}.", file=sys.stderr)
+        sys.exit(2)
+
+    start_time = time.time()
+    # Candidates are raw bytes, written to the binary stream under the text wrapper
+    if args.output == '-':
+        word_count, candidate_count = apply_rules_to_wordlist(rules, args.wordlist, sys.stdout.buffer,
+                                                              max(args.workers, 1), args.chunk_words)
+        sys.stdout.buffer.flush()
+    else:
+        with generator.open_wordlist(args.output, 'w') as output_file:
+            word_count, candidate_count = apply_rules_to_wordlist(rules, args.wordlist, output_file.buffer,
+                                                                  max(args.workers, 1), args.chunk_words)
+    elapsed = max(time.time() - start_time, 1e-9)
+    print(f"\nApplied {len(rules)} rules to {word_count} words: {candidate_count} candidates "
+          f"({candidate_count / elapsed:.0f} candidates/sec)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
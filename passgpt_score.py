@@ -0,0 +1,184 @@
+"""
+Script Purpose:
+Re-rank an existing wordlist by PassGPT likelihood so hashcat tries the most probable candidates first.
+The wordlist (plain, .gz or .zst) is streamed in memory-bounded chunks. Each chunk is tokenized, sorted by
+length and scored in padded batches. Every batch needs a single forward pass, which yields the log-probability
+of each password as a whole sequence (<s>, its characters, </s>), the probability of the model sampling
+exactly that password. Scored chunks are spilled to sorted run files and merged, so lists larger than RAM
+are ordered with an external sort. Lines are written back byte for byte, most likely first. Passwords longer
+than the model can generate (more than 17 characters) cannot be scored and are written last.
+
+Usage:
+ - python3 passgpt_score.py rockyou.txt --output rockyou-ranked.txt
+ - python3 passgpt_score.py wordlist.txt.gz --output ranked.txt.zst --precision int8 --with-scores
+ - python3 passgpt_score.py wordlist.txt --output ranked.txt --backend onnx (after `passgpt_generator.py prepare --onnx`)
+ - 16 character model: --model 16 --api-token <key> (or set HF_TOKEN)
+"""
+
+import argparse
+import heapq
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import passgpt_generator as generator
+import torch
+
+SCORE_BATCH_SIZE = 2048  # Passwords per forward pass
+UNSCORABLE = float('-inf')
+
+def read_chunks(file_path, memory_budget):
+    """Yield lists of passwords (line endings stripped, undecodable bytes kept) that each fit the memory budget."""
+    chunk, chunk_bytes = [], 0
+    with generator.open_wordlist_bytes(file_path) as wordlist:
+        for line in wordlist:
+            password = line.rstrip(b'\r\n').decode('utf-8', errors='surrogateescape')
+            chunk.append(password)
+            chunk_bytes += 3 * (sys.getsizeof(password) + 8)  # The password, its tokens and its score record
+            if chunk_bytes >= memory_budget:
+                yield chunk
+                chunk, chunk_bytes = [], 0
+    if chunk:
+        yield chunk
+
+def sequence_log_probs(model, tokenizer, token_ids):
+    """Log-probability of each token sequence as a complete password, from one forward pass over the batch."""
+    lengths = torch.tensor([len(ids) + 2 for ids in token_ids])
+    width = int(lengths.max())
+    input_ids = torch.tensor([[tokenizer.bos_token_id] + ids + [tokenizer.eos_token_id] +
+                              [tokenizer.pad_token_id] * (width - len(ids) - 2) for ids in token_ids])
+    attention_mask = torch.arange(width)[None, :] < lengths[:, None]
+    device = generator.get_device()
+    with torch.no_grad():
+        logits = model(input_ids=input_ids.to(device), attention_mask=attention_mask.to(device),
+                       use_cache=False).logits
+    log_probs = torch.log_softmax(logits[:, :-1].float(), dim=-1)
+    token_log_probs = log_probs.gather(-1, input_ids[:, 1:, None].to(device)).squeeze(-1).cpu()
+    return token_log_probs.masked_fill(~attention_mask[:, 1:], 0.0).sum(dim=1).tolist()
+
+def score_chunk(model, tokenizer, passwords, batch_size=SCORE_BATCH_SIZE):
+    """Return (log_prob, password) for a chunk, scoring it in batches of equal or similar length."""
+    # The tokenizer only takes valid text, so undecodable bytes are scored as U+FFFD
+    texts = [password if password.isascii() else password.encode('utf-8', 'surrogateescape').decode('utf-8', 'replace')
+             for password in passwords]
+    token_ids = tokenizer(texts, add_special_tokens=False, padding=False, truncation=False, verbose=False)['input_ids']
+    scores = [UNSCORABLE] * len(passwords)
+    order = sorted((i for i, ids in enumerate(token_ids) if len(ids) <= generator.MAX_PASSWORD_LENGTH),
+                   key=lambda i: len(token_ids[i]))  # Length-sorted batches need (almost) no padding
+    for start in range(0, len(order), batch_size):
+        batch = order[start:start + batch_size]
+        for i, log_prob in zip(batch, sequence_log_probs(model, tokenizer, [token_ids[i] for i in batch])):
+            scores[i] = log_prob
+    return list(zip(scores, passwords))
+
+def write_score_run(scored, run_dir):
+    """Sort scored passwords by descending likelihood and spill them to a run file, returning its path."""
+    scored.sort(key=lambda record: -record[0])  # Stable, so equal scores keep their input order
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, encoding='utf-8', errors='surrogateescape',
+                                     dir=run_dir, suffix='.run') as run_file:
+        run_file.writelines(f"{score!r}\t{password}\n" for score, password in scored)
+    return run_file.name
+
+def read_score_run(run_path):
+    """Yield the (log_prob, password) records of a run file in order."""
+    with open(run_path, 'r', encoding='utf-8', errors='surrogateescape', newline='\n') as run_file:
+        for line in run_file:
+            score, _, password = line[:-1].partition('\t')
+            yield float(score), password
+
+def merge_score_runs(run_paths, output_file, with_scores=False):
+    """Merge runs into an open output file by descending likelihood. Returns the number of lines written."""
+    line_count = 0
+    for score, password in heapq.merge(*(read_score_run(run_path) for run_path in run_paths),
+                                       key=lambda record: -record[0]):
+        output_file.write(f"{score!r}\t{password}\n" if with_scores else password + '\n')
+        line_count += 1
+    return line_count
+
+def score_wordlist(model, tokenizer, input_path, output_path, memory_budget_mb=generator.SORT_MEMORY_BUDGET_MB,
+                   batch_size=SCORE_BATCH_SIZE, with_scores=False, work_dir=None):
+    """Write input_path to output_path ordered by PassGPT likelihood. Returns (lines written, passwords/sec)."""
+    run_dir = tempfile.mkdtemp(prefix='passgpt-score-', dir=work_dir or os.path.dirname(os.path.abspath(output_path)))
+    try:
+        run_paths = []
+        scored_total, start_time = 0, time.time()
+        for chunk in read_chunks(input_path, max(memory_budget_mb, 1) * 1024 * 1024):
+            run_paths.append(write_score_run(score_chunk(model, tokenizer, chunk, batch_size), run_dir))
+            scored_total += len(chunk)
+            print(f"Scored {scored_total} passwords ({scored_total / (time.time() - start_time):.0f} passwords/sec)")
+        rate = scored_total / max(time.time() - start_time, 1e-9)
+
+        # Reduce the number of runs until they can all be merged at once
+        while len(run_paths) > generator.SORT_MAX_MERGE_FAN_IN:
+            merged_paths = []
+            for i in range(0, len(run_paths), generator.SORT_MAX_MERGE_FAN_IN):
+                group = run_paths[i:i + generator.SORT_MAX_MERGE_FAN_IN]
+                with tempfile.NamedTemporaryFile(mode='w', delete=False, encoding='utf-8', errors='surrogateescape',
+                                                 dir=run_dir, suffix='.run') as merged_file:
+                    merge_score_runs(group, merged_file, with_scores=True)
+                for run_path in group:
+                    os.remove(run_path)
+                merged_paths.append(merged_file.name)
+            run_paths = merged_paths
+
+        temp_output_path = os.path.join(run_dir, 'ranked-' + os.path.basename(output_path))
+        with generator.open_wordlist(temp_output_path, 'w') as output_file:
+            output_file.reconfigure(errors='surrogateescape')  # Write undecodable input bytes back unchanged
+            line_count = merge_score_runs(run_paths, output_file, with_scores)
+        shutil.move(temp_output_path, output_path)
+        return line_count, rate
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Re-rank a wordlist by PassGPT likelihood, most probable first.")
+    parser.add_argument('wordlist', help="Wordlist to score (plain, .gz or .zst)")
+    parser.add_argument('--output', required=True,
+                        help="Ranked wordlist to write; a .gz or .zst suffix compresses it")
+    parser.add_argument('--model', choices=['10', '16'], default='10',
+                        help="Model to score with: 10 or 16 character PassGPT (default: 10)")
+    parser.add_argument('--api-token', default=os.environ.get('HF_TOKEN'),
+                        help="Hugging Face API key for the 16 character model (default: $HF_TOKEN)")
+    parser.add_argument('--model-cache', default=generator.MODEL_CACHE_DIR,
+                        help=f"Load models saved there by `passgpt_generator.py prepare` offline "
+                             f"(default: {generator.MODEL_CACHE_DIR})")
+    parser.add_argument('--precision', choices=['fp32', 'int8', 'bf16'], default='fp32',
+                        help="Inference precision: fp32, dynamic int8 quantization (CPU) or bf16 autocast (default: fp32)")
+    parser.add_argument('--compile', action='store_true',
+                        help="Capture the model forward pass with torch.compile")
+    parser.add_argument('--backend', choices=['torch', 'onnx'], default='torch',
+                        help="Inference engine: PyTorch, or ONNX Runtime on the decoder exported by "
+                             "`passgpt_generator.py prepare --onnx` (CPU) (default: torch)")
+    parser.add_argument('--batch-size', type=int, default=SCORE_BATCH_SIZE,
+                        help=f"Passwords per forward pass (default: {SCORE_BATCH_SIZE})")
+    parser.add_argument('--sort-memory-mb', type=int, default=generator.SORT_MEMORY_BUDGET_MB,
+                        help=f"Memory for one scored chunk before it is spilled to a sorted run "
+                             f"(default: {generator.SORT_MEMORY_BUDGET_MB})")
+    parser.add_argument('--work-dir', default=None,
+                        help="Directory for the sorted runs (default: the output file's directory)")
+    parser.add_argument('--with-scores', action='store_true',
+                        help="Prefix each line with its natural-log probability and a tab")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    if not os.path.isfile(args.wordlist):
+        print(f"File not found: {args.wordlist}")
+        sys.exit(2)
+    if args.model == '16' and not args.api_token:
+        print("The 16 char model requires --api-token or the HF_TOKEN environment variable.")
+        sys.exit(2)
+    if args.backend == 'onnx' and (args.precision != 'fp32' or args.compile):
+        print("--backend onnx runs the exported fp32 graph; --precision and --compile apply to the torch backend.")
+        sys.exit(2)
+    model, tokenizer = generator.load_selected_model('2' if args.model == '16' else '1', args.api_token, args.precision,
+                                                     args.compile, cache_dir=args.model_cache, backend=args.backend)
+    line_count, rate = score_wordlist(model, tokenizer, args.wordlist, args.output, args.sort_memory_mb,
+                                      args.batch_size, args.with_scores, args.work_dir)
+    print(f"\nWrote {line_count} passwords ranked by likelihood to {args.output} "
+          f"(scored at {rate:.0f} passwords/sec)")
+
+if __name__ == "__main__":
+    main()
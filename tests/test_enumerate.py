@@ -0,0 +1,42 @@
+import pytest
+
+import passgpt_benchmark
+import passgpt_score
+from passgpt_generator import BestFirstEnumerator, build_guided_logits_processor, decode_passwords
+
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory):
+    return passgpt_benchmark.build_tiny_model(str(tmp_path_factory.mktemp("model")))
+
+
+def sequence_scores(model, tokenizer, sequences):
+    """Model log-probability of each enumerated sequence (BOS, characters, EOS)."""
+    return passgpt_score.sequence_log_probs(model, tokenizer, [list(tokens[1:-1]) for tokens in sequences])
+
+
+def test_mask_enumeration_is_exhaustive_and_ordered(tiny_model):
+    model, tokenizer = tiny_model
+    enumerator = BestFirstEnumerator(tokenizer, build_guided_logits_processor(tokenizer, mask="?d"))
+    sequences = enumerator.enumerate(model, 30)
+    passwords = [tokenizer.decode(tokens[1:-1]) for tokens in sequences]
+    assert sorted(passwords) == list("0123456789")
+    assert enumerator.exhausted
+    scores = sequence_scores(model, tokenizer, sequences)
+    assert scores == sorted(scores, reverse=True)
+    assert enumerator.enumerate(model, 30) == []
+
+
+def test_unconstrained_enumeration_emits_no_special_tokens(tiny_model):
+    model, tokenizer = tiny_model
+    enumerator = BestFirstEnumerator(tokenizer)
+    generated = enumerator(model, tokenizer, 200)
+    assert len(generated) == 200 and not enumerator.exhausted
+    special = set(tokenizer.all_special_ids) - {tokenizer.eos_token_id, tokenizer.pad_token_id}
+    for row in generated.tolist():
+        assert row[0] == tokenizer.bos_token_id and not special & set(row[1:])
+    passwords = decode_passwords(tokenizer, generated)
+    assert len(set(passwords)) == len(passwords)
+    scores = passgpt_score.sequence_log_probs(model, tokenizer, [tokenizer(password, add_special_tokens=False)
+                                                                 ["input_ids"] for password in passwords])
+    assert all(earlier >= later - 1e-4 for earlier, later in zip(scores, scores[1:]))
@@ -0,0 +1,52 @@
+import os
+
+from passgpt_generator import FINGERPRINT_DELTA_FILE, FingerprintIndex
+
+
+def test_filter_novel_drops_repeats_within_and_across_batches(tmp_path):
+    index = FingerprintIndex(str(tmp_path))
+    assert index.filter_novel(["alpha", "beta", "alpha"]) == ["alpha", "beta"]
+    assert index.filter_novel(["beta", "gamma"]) == ["gamma"]
+    assert len(index) == 3
+    index.close()
+
+
+def test_delta_log_is_replayed_by_the_next_session(tmp_path):
+    index = FingerprintIndex(str(tmp_path))
+    index.filter_novel(["alpha", "beta"])
+    index.close()
+    assert os.path.getsize(tmp_path / FINGERPRINT_DELTA_FILE) == 16
+
+    index = FingerprintIndex(str(tmp_path))
+    assert not index.is_new
+    assert index.filter_novel(["alpha", "beta", "gamma"]) == ["gamma"]
+    index.close()
+
+
+def test_partial_trailing_delta_entry_is_ignored(tmp_path):
+    index = FingerprintIndex(str(tmp_path))
+    index.filter_novel(["alpha"])
+    index.close()
+    with open(tmp_path / FINGERPRINT_DELTA_FILE, 'ab') as delta_file:
+        delta_file.write(b'\x01\x02\x03')  # A crash mid-append
+
+    index = FingerprintIndex(str(tmp_path))
+    assert len(index) == 1
+    assert index.filter_novel(["alpha", "beta"]) == ["beta"]
+    index.close()
+
+
+def test_merge_folds_the_delta_into_the_sorted_index(tmp_path):
+    passwords = [f"password{i}" for i in range(50)]
+    index = FingerprintIndex(str(tmp_path), merge_threshold=8)
+    for start in range(0, len(passwords), 10):
+        assert index.filter_novel(passwords[start:start + 10]) == passwords[start:start + 10]
+        index.sync()
+    index.close()
+    assert not os.path.exists(tmp_path / FINGERPRINT_DELTA_FILE)
+
+    index = FingerprintIndex(str(tmp_path), merge_threshold=8)
+    assert len(index) == len(passwords)
+    assert list(index.index_view) == sorted(index.index_view)
+    assert index.filter_novel(passwords + ["new"]) == ["new"]
+    index.close()
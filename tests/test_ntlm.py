@@ -0,0 +1,63 @@
+import torch
+
+import passgpt_generator
+from passgpt_generator import NTLMHashIndex, md4_digest, ntlm_hash_keys, parse_hash_line
+
+PASSWORDS = ["", "a", "password", "P@ssw0rd!", "correct horse battery staple", "pässwörd", "密码123",
+             "x" * 27, "x" * 28, "y" * 60]  # 28+ characters no longer fit one MD4 block
+
+
+def ntlm_hex(password):
+    return md4_digest(password.encode('utf-16-le')).hex().upper()
+
+
+def test_md4_digest_matches_rfc_1320():
+    assert md4_digest(b"").hex() == "31d6cfe0d16ae931b73c59d7e0c089c0"
+    assert md4_digest(b"abc").hex() == "a448017aaf21d8525fc10ae87aa6729d"
+    assert md4_digest(b"12345678901234567890123456789012345678901234567890123456789012345678901234567890").hex() \
+        == "e33b4ddc9c38f2199c3e7b164fcc0536"
+
+
+def test_vectorized_ntlm_matches_md4_digest():
+    assert ntlm_hex("password") == "8846F7EAEE8FB117AD06BDD830B7586C"
+    keys, tails = ntlm_hash_keys(PASSWORDS)
+    for password, key, tail in zip(PASSWORDS, keys.tolist(), tails.tolist()):
+        digest = key.to_bytes(8, 'little', signed=True) + tail.to_bytes(8, 'little', signed=True)
+        assert digest.hex().upper() == ntlm_hex(password), password
+
+
+def test_parse_hash_line_formats():
+    digest = ntlm_hex("password")
+    expected = parse_hash_line(digest)
+    assert expected[2] == 1
+    assert parse_hash_line(f"42:{digest}") == expected[:2] + (42,)
+    assert parse_hash_line(f"{digest.lower()}:7\n") == expected[:2] + (7,)
+    assert parse_hash_line("not a hash") is None
+
+
+def test_index_lookup_finds_only_listed_hashes(tmp_path):
+    hash_path = tmp_path / "hashes.txt"
+    hash_path.write_text(f"12:{ntlm_hex('password')}\n3:{ntlm_hex('y' * 60)}\n{ntlm_hex('password')}\n"
+                         f"garbage\n", encoding='utf-8')
+    index_path = str(tmp_path / "ntlm.idx")
+    assert NTLMHashIndex.compile([str(hash_path)], index_path) == 2
+    index = NTLMHashIndex(index_path)
+    cracked = index.lookup(["letmein", "password", "y" * 60])
+    assert [(hash_value, plain) for _, hash_value, plain in cracked] == [(ntlm_hex("password"), "password"),
+                                                                        (ntlm_hex("y" * 60), "y" * 60)]
+    assert cracked[1][0] == 3
+    index.close()
+
+
+def test_compile_merges_many_runs_with_a_bounded_fan_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(passgpt_generator, 'SORT_MAX_MERGE_FAN_IN', 3)
+    passwords = [f"pw{i}" for i in range(6000)]
+    hash_path = tmp_path / "hashes.txt"
+    hash_path.write_text("".join(f"{i % 9 + 1}:{ntlm_hex(password)}\n" for i, password in enumerate(passwords * 2)),
+                         encoding='utf-8')
+    index_path = str(tmp_path / "ntlm.idx")
+    assert NTLMHashIndex.compile([str(hash_path)], index_path, memory_budget_mb=0) == len(passwords)  # 12 runs
+    index = NTLMHashIndex(index_path)
+    assert torch.equal(index.keys, index.keys.sort().values)
+    assert sorted(plain for _, _, plain in index.lookup(passwords + ["missing"])) == sorted(passwords)
+    index.close()
@@ -0,0 +1,12 @@
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+
+import passgpt_benchmark
+
+
+def test_onnx_decoder_matches_torch_through_the_kv_cache(tmp_path):
+    parity = passgpt_benchmark.check_onnx_parity(str(tmp_path))
+    assert parity["passed"], parity
+    assert parity["decode_max_logit_diff"] < 1e-4
@@ -0,0 +1,25 @@
+import passgpt_generator
+from passgpt_generator import ReferenceWordlistIndex
+
+
+def test_filter_unknown_drops_reference_passwords(tmp_path):
+    wordlist = tmp_path / "rockyou.txt"
+    wordlist.write_bytes(b"123456\r\npassword\n\nbad\xffbytes\n123456\n")
+    index_path = str(tmp_path / "known.idx")
+    assert ReferenceWordlistIndex.compile([str(wordlist)], index_path) == 3
+    index = ReferenceWordlistIndex(index_path)
+    assert index.filter_unknown(["password", "novel1", "123456", "novel2"]) == (["novel1", "novel2"], 2)
+    index.close()
+
+
+def test_compile_merges_many_runs_with_a_bounded_fan_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(passgpt_generator, 'SORT_MAX_MERGE_FAN_IN', 3)
+    passwords = [f"word{i}" for i in range(6000)]
+    wordlist = tmp_path / "reference.txt"
+    wordlist.write_text("\n".join(passwords * 2) + "\n", encoding='utf-8')
+    index_path = str(tmp_path / "known.idx")
+    assert ReferenceWordlistIndex.compile([str(wordlist)], index_path, memory_budget_mb=0) == len(passwords)
+    index = ReferenceWordlistIndex(index_path)
+    assert list(index.index_view) == sorted(index.index_view)
+    assert index.filter_unknown(passwords + ["missing"]) == (["missing"], len(passwords))
+    index.close()
@@ -0,0 +1,87 @@
+import pytest
+
+from passgpt_generator import load_rule_file, mutate_words, parse_rule, rule_candidate_bytes
+
+# Examples from the hashcat rule-based attack documentation, applied to p@ssW0rd
+HASHCAT_EXAMPLES = [
+    (":", "p@ssW0rd"), ("l", "p@ssw0rd"), ("u", "P@SSW0RD"), ("c", "P@ssw0rd"), ("C", "p@SSW0RD"),
+    ("t", "P@SSw0RD"), ("T3", "p@sSW0rd"), ("r", "dr0Wss@p"), ("d", "p@ssW0rdp@ssW0rd"),
+    ("p2", "p@ssW0rdp@ssW0rdp@ssW0rd"), ("f", "p@ssW0rddr0Wss@p"), ("{", "@ssW0rdp"), ("}", "dp@ssW0r"),
+    ("$1$2", "p@ssW0rd12"), ("^2^1", "12p@ssW0rd"), ("[", "@ssW0rd"), ("]", "p@ssW0r"), ("D3", "p@sW0rd"),
+    ("x04", "p@ss"), ("O12", "psW0rd"), ("i4!", "p@ss!W0rd"), ("o3$", "p@s$W0rd"), ("'6", "p@ssW0"),
+    ("ss$", "p@$$W0rd"), ("@s", "p@W0rd"), ("z2", "ppp@ssW0rd"), ("Z2", "p@ssW0rddd"),
+    ("q", "pp@@ssssWW00rrdd"), ("k", "@pssW0rd"), ("K", "p@ssW0dr"), ("*34", "p@sWs0rd"),
+    ("R2", "p@9sW0rd"), ("+2", "p@tsW0rd"), ("-1", "p?ssW0rd"), (".1", "psssW0rd"), (",1", "ppssW0rd"),
+    ("y2", "p@p@ssW0rd"), ("Y2", "p@ssW0rdrd"),
+]
+
+
+def apply(rule, word):
+    return mutate_words([parse_rule(rule)], [word.encode('utf-8')])
+
+
+@pytest.mark.parametrize("rule,expected", HASHCAT_EXAMPLES)
+def test_hashcat_documentation_examples(rule, expected):
+    assert apply(rule, "p@ssW0rd") == [expected]
+
+
+def test_title_case_functions():
+    assert apply("E", "p@ssW0rd w0rld") == ["P@ssw0rd W0rld"]
+    assert apply("e-", "pass-word") == ["Pass-Word"]
+
+
+@pytest.mark.parametrize("rule,kept", [
+    ("<8", True), ("<7", False), (">8", True), (">9", False), ("_8", True), ("_7", False),
+    ("!W", False), ("!z", True), ("/W", True), ("/z", False), ("(p", True), ("(@", False),
+    (")d", True), (")r", False), ("=1@", True), ("=1s", False), ("%2s", True), ("%3s", False),
+])
+def test_reject_functions(rule, kept):
+    assert apply(rule, "p@ssW0rd") == (["p@ssW0rd"] if kept else [])
+
+
+def test_out_of_range_positions_leave_the_word_unchanged():
+    assert apply("T9", "abc") == ["abc"]
+    assert apply("D9", "abc") == ["abc"]
+    assert apply("i9!", "abc") == ["abc"]
+
+
+def test_byte_shift_is_applied_to_the_encoded_word():
+    ((data, lengths),) = rule_candidate_bytes([parse_rule("L2")], [b"p@ssW0rd"])
+    assert data == b"p@\xe6sW0rd" and lengths.tolist() == [8]
+    assert apply("L2", "p@ssW0rd") == []  # Not valid UTF-8, so not a pipeline candidate
+
+
+def test_length_limits():
+    words = [b"abc", b"x" * 255, b"y" * 256]
+    assert apply("d", "abc") == ["abcabc"]
+    assert mutate_words([parse_rule(":")], words) == ["abc", "x" * 255]  # Too long for hashcat's rule buffer
+    assert mutate_words([parse_rule("$!")], words, max_length=3) == []
+    assert mutate_words([parse_rule("]")], [b"a"]) == []  # Empty candidates are dropped
+
+
+def test_rules_are_applied_rule_by_rule_in_order():
+    rules = [parse_rule("u"), parse_rule("$1")]
+    assert mutate_words(rules, [b"ab", b"cd"]) == ["AB", "CD", "ab1", "cd1"]
+    ((data, _), (data2, _)) = rule_candidate_bytes(rules, [b"ab", b"cd"], terminator=ord('\n'))
+    assert data + data2 == b"AB\nCD\nab1\ncd1\n"
+
+
+def test_load_rule_file_skips_comments_and_unsupported_rules(tmp_path):
+    rule_path = tmp_path / "test.rule"
+    rule_path.write_text("# comment\n\n:\nu $1\nM\nXa12\n$\n", encoding='utf-8')
+    rules, skipped = load_rule_file(str(rule_path))
+    assert rules == [parse_rule(":"), parse_rule("u$1")]
+    assert [(line_number, rule) for line_number, rule, _ in skipped] == [(5, "M"), (6, "Xa12"), (7, "$")]
+
+
+def test_standalone_tool_writes_raw_candidates_in_input_order(tmp_path):
+    import passgpt_rules
+
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_bytes(b"abc\r\nd\xffe\nxyz\n")
+    output_path = tmp_path / "out.txt"
+    with open(output_path, 'wb') as output_file:
+        counts = passgpt_rules.apply_rules_to_wordlist([parse_rule(":"), parse_rule("u")], str(wordlist),
+                                                       output_file, workers=1, chunk_words=2)
+    assert counts == (3, 6)
+    assert output_path.read_bytes() == b"abc\nd\xffe\nABC\nD\xffE\nxyz\nXYZ\n"
@@ -0,0 +1,171 @@
+import gzip
+import queue
+
+from passgpt_generator import (NTLM_CRACKED_FILE, BucketWriterPool, FingerprintIndex, NTLMHashIndex,
+                               PasswordWriterStage, PipelineStats, SessionCheckpoint, list_bucket_files,
+                               load_session_manifest, md4_digest, open_wordlist, restore_session_files)
+
+BATCHES = [
+    ["alpha", "beta", "gamma1"],
+    ["beta", "delta12", "epsilon"],
+    ["zeta", "alpha", "eta1234"],
+]
+
+
+def start_writer(output_dir, manifest=None, ntlm_index=None):
+    """Start a writer stage that only checkpoints when told to, optionally resuming from a manifest."""
+    writer = PasswordWriterStage(output_dir, None, queue.Queue(), PipelineStats(["Writer"]),
+                                 FingerprintIndex(output_dir), BucketWriterPool(output_dir),
+                                 SessionCheckpoint(output_dir, {}, interval=float('inf'), previous=manifest),
+                                 ntlm_index=ntlm_index)
+    if manifest is not None:
+        writer.resume_from(manifest)
+    writer.start()
+    return writer
+
+
+def write_batch(writer, iteration, passwords):
+    """Hand the writer a batch as worker processes do (already decoded) and wait until it is written."""
+    writer.work_queue.put((iteration, list(passwords), {"sampler": [iteration]}, {}))
+    writer.work_queue.join()
+    assert writer.error is None
+
+
+def stop_writer(writer):
+    writer.work_queue.put(None)
+    writer.join()
+    writer.writer_pool.close()
+    writer.fingerprint_index.close()
+    writer.close()
+
+
+def crash_writer(writer):
+    """Stop like a killed session: everything written reaches disk, but no checkpoint records it."""
+    writer.writer_pool.flush()
+    writer.fingerprint_index.sync(merge=False)
+    stop_writer(writer)
+
+
+def read_buckets(output_dir):
+    contents = {}
+    for file_name in list_bucket_files(output_dir):
+        with open_wordlist(str(output_dir / file_name)) as bucket:
+            lines = bucket.read().splitlines()
+        if lines:
+            contents[file_name] = lines
+    return contents
+
+
+def run_uninterrupted(output_dir):
+    output_dir.mkdir(exist_ok=True)
+    writer = start_writer(output_dir)
+    for iteration, passwords in enumerate(BATCHES, 1):
+        write_batch(writer, iteration, passwords)
+    writer.checkpoint(status='completed')
+    stop_writer(writer)
+    return read_buckets(output_dir), load_session_manifest(output_dir)
+
+
+def test_resume_after_crash_matches_an_uninterrupted_session(tmp_path):
+    expected_buckets, expected_manifest = run_uninterrupted(tmp_path / "reference")
+
+    output_dir = tmp_path / "resumed"
+    output_dir.mkdir()
+    writer = start_writer(output_dir)
+    write_batch(writer, 1, BATCHES[0])
+    writer.checkpoint()
+    write_batch(writer, 2, BATCHES[1])  # Lost in the crash and replayed on resume
+    crash_writer(writer)
+
+    manifest = load_session_manifest(output_dir)
+    assert manifest['status'] == 'running' and manifest['iteration'] == 1
+    assert manifest['rng_state'] == {"sampler": [1]}
+    restore_session_files(output_dir, manifest)
+    restored = [line for lines in read_buckets(output_dir).values() for line in lines]
+    assert sorted(restored) == sorted(BATCHES[0])
+
+    writer = start_writer(output_dir, manifest)
+    write_batch(writer, 2, BATCHES[1])
+    write_batch(writer, 3, BATCHES[2])
+    writer.checkpoint(status='completed')
+    stop_writer(writer)
+
+    assert read_buckets(output_dir) == expected_buckets
+    manifest = load_session_manifest(output_dir)
+    for key in ('iteration', 'sampled', 'unique_written', 'written_by_length', 'rng_state'):
+        assert manifest[key] == expected_manifest[key]
+
+
+def test_finished_sessions_are_not_truncated(tmp_path):
+    expected_buckets, manifest = run_uninterrupted(tmp_path)
+    with open(tmp_path / "05-char-wordlist.txt", 'a', encoding='utf-8') as bucket:
+        bucket.write("extra\n")
+    restore_session_files(tmp_path, manifest)
+    assert read_buckets(tmp_path)["05-char-wordlist.txt"] == expected_buckets["05-char-wordlist.txt"] + ["extra"]
+
+
+def test_resume_does_not_repeat_cracked_hashes(tmp_path):
+    hash_path = tmp_path / "hashes.txt"
+    hash_path.write_text("".join(f"2:{md4_digest(password.encode('utf-16-le')).hex()}\n"
+                                 for password in ("beta", "delta12", "eta1234")), encoding='utf-8')
+    NTLMHashIndex.compile([str(hash_path)], str(tmp_path / "ntlm.idx"))
+    output_dir = tmp_path / "session"
+    output_dir.mkdir()
+
+    ntlm_index = NTLMHashIndex(str(tmp_path / "ntlm.idx"))
+    writer = start_writer(output_dir, ntlm_index=ntlm_index)
+    write_batch(writer, 1, BATCHES[0])
+    writer.checkpoint()
+    write_batch(writer, 2, BATCHES[1])
+    crash_writer(writer)
+
+    manifest = load_session_manifest(output_dir)
+    restore_session_files(output_dir, manifest)
+    writer = start_writer(output_dir, manifest, ntlm_index)
+    write_batch(writer, 2, BATCHES[1])
+    write_batch(writer, 3, BATCHES[2])
+    writer.checkpoint(status='completed')
+    stop_writer(writer)
+    ntlm_index.close()
+
+    cracked = (output_dir / NTLM_CRACKED_FILE).read_text(encoding='utf-8').splitlines()
+    assert [line.rsplit(':', 1)[1] for line in cracked] == ["beta", "delta12", "eta1234"]
+    assert load_session_manifest(output_dir)['cracked'] == 3
+
+
+def test_crash_resumes_keep_buckets_this_session_does_not_write(tmp_path):
+    # Completed work from earlier sessions: another compression and a long rule bucket
+    with gzip.open(tmp_path / "08-char-wordlist.txt.gz", 'wt', encoding='utf-8') as bucket:
+        bucket.write("earlier1\n")
+    (tmp_path / "25-char-wordlist.txt").write_text("x" * 25 + "\n", encoding='utf-8')
+    earlier = {file_name: (tmp_path / file_name).read_bytes()
+               for file_name in ("08-char-wordlist.txt.gz", "25-char-wordlist.txt")}
+    long_password = "a-rule-mutated-password"  # Its bucket is only created after the checkpoint
+
+    writer = start_writer(tmp_path)
+    write_batch(writer, 1, BATCHES[0])
+    writer.checkpoint()
+    write_batch(writer, 2, BATCHES[1] + [long_password])
+    crash_writer(writer)
+
+    for _ in range(2):  # Crash again right after resuming
+        manifest = load_session_manifest(tmp_path)
+        restore_session_files(tmp_path, manifest)
+        assert (tmp_path / f"{len(long_password)}-char-wordlist.txt").read_text(encoding='utf-8') == ""
+        writer = start_writer(tmp_path, manifest)
+        crash_writer(writer)
+
+    manifest = load_session_manifest(tmp_path)
+    restore_session_files(tmp_path, manifest)
+    writer = start_writer(tmp_path, manifest)
+    write_batch(writer, 2, BATCHES[1] + [long_password])
+    writer.checkpoint(status='completed')
+    stop_writer(writer)
+
+    for file_name, contents in earlier.items():
+        assert (tmp_path / file_name).read_bytes() == contents
+    buckets = read_buckets(tmp_path)
+    assert buckets[f"{len(long_password)}-char-wordlist.txt"] == [long_password]
+    written = [line for file_name, lines in buckets.items() if file_name.endswith('.txt') and file_name[:2] < "18"
+               for line in lines]
+    assert sorted(written) == sorted(set(BATCHES[0] + BATCHES[1]))